@@ -1,132 +1,264 @@
-import requests
+from __future__ import annotations
+
 import aiohttp
-import json
+import requests
+import orjson
 import urllib.parse
 import asyncio
 import logging
+import time
+import random
+import hashlib
+from uuid import uuid4
+from functools import partial
+from dataclasses import dataclass, replace
 import os  # Add this import for file operations
 from todoist_api_python.api_async import TodoistAPIAsync  # Use the async version of the API
 
-# Ensure config.json exists
 CONFIG_FILE = "config.json"
-if not os.path.exists(CONFIG_FILE):
-    with open(CONFIG_FILE, "w") as config_file:
-        json.dump({
-            "server_url": "",
-            "api_token": "",
-            "todoist_api_token": "",
-            "debug": False
-        }, config_file)
-    logging.warning(f"{CONFIG_FILE} not found. Created an empty config file. Please populate it with the required values.")
-
-# Load configuration from config.json
-with open(CONFIG_FILE, "r") as config_file:
-    config = json.load(config_file)
-
-JIRA_SERVER_URL = config["server_url"]
-JIRA_API_TOKEN = config["api_token"]
-TODOIST_API_TOKEN = config["todoist_api_token"]
-
-# Configure logging
-DEBUG_MODE = config.get("debug", False)  # Enable debug mode based on config
-logging.basicConfig(
-    level=logging.DEBUG if DEBUG_MODE else logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
-
-def get_current_jira_user():
+
+@dataclass(frozen=True)
+class Config:
+    """Settings loaded from config.json."""
+    jira_server_url: str
+    jira_api_token: str
+    todoist_api_token: str
+    jira_username: str | None = None
+    debug: bool = False
+
+# Shared HTTP session, created lazily and reused for every Jira and Todoist Sync request
+_session: aiohttp.ClientSession | None = None
+
+async def get_session(cfg):
+    """Return the shared aiohttp session, creating it with a pooled connector on first use."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=10, enable_cleanup_closed=True, ttl_dns_cache=300)
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30, connect=10),
+            headers={
+                "Authorization": f"Bearer {cfg.jira_api_token}",
+                "Content-Type": "application/json"
+            }
+        )
+    return _session
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_CONCURRENT_REQUESTS = 8
+
+async def bounded(semaphore, coro):
+    """Await coro while holding the semaphore, capping how many requests are in flight."""
+    async with semaphore:
+        return await coro
+
+def _error_status_and_headers(error):
+    """Return the HTTP status and headers of an aiohttp or Todoist SDK (requests) error."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status, error.headers or {}
+    if error.response is None:
+        return None, {}
+    return error.response.status_code, error.response.headers
+
+async def retry_with_backoff(request, *, retries=3, base=1.0, cap=30.0):
+    """Await request(), retrying transient HTTP failures with exponential backoff and jitter.
+
+    Handles both aiohttp errors and the requests errors raised by the Todoist SDK.
+    """
+    for attempt in range(retries + 1):
+        delay = None
+        try:
+            return await request()
+        except (aiohttp.ClientResponseError, requests.HTTPError) as error:
+            last_error = error
+            status, headers = _error_status_and_headers(error)
+            if status not in RETRYABLE_STATUSES or attempt == retries:
+                raise
+            # Honor the server's Retry-After hint when it gives one in seconds
+            retry_after = headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = int(retry_after)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError,
+                requests.ConnectionError, requests.Timeout) as error:
+            last_error = error
+            if attempt == retries:
+                raise
+        if delay is None:
+            delay = min(cap, base * 2 ** attempt) * (1 + random.random() * 0.5)
+        logging.warning(f"Request failed ({last_error!r}), retrying in {delay:.1f}s (attempt {attempt + 1}/{retries})")
+        await asyncio.sleep(delay)
+
+async def get_current_jira_user(cfg):
     """Fetch the current Jira user based on the API token."""
-    url = f"{JIRA_SERVER_URL}/rest/api/2/myself"
-    headers = {
-        "Authorization": f"Bearer {JIRA_API_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    user = response.json()["name"]
+    url = f"{cfg.jira_server_url}/rest/api/2/myself"
+    session = await get_session(cfg)
+
+    async def fetch():
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())
+
+    user_json = await retry_with_backoff(fetch)
+    user = user_json["name"]
     logging.info(f"Autofound Jira username: {user}")  # Log the autofound username
-    logging.debug(f"Fetched current Jira user: {response.json()}")
+    logging.debug(f"Fetched current Jira user: {user_json}")
     return user
 
-# Update JIRA_USERNAME to fetch dynamically if not provided in config
-JIRA_USERNAME = config.get("jira_username") or get_current_jira_user()
+async def init():
+    """Load configuration, set up logging, and resolve the Jira username before the sync loop starts."""
+    # Ensure config.json exists
+    if not os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, "wb") as config_file:
+            config_file.write(orjson.dumps({
+                "server_url": "",
+                "api_token": "",
+                "todoist_api_token": "",
+                "debug": False
+            }))
+        logging.warning(f"{CONFIG_FILE} not found. Created an empty config file. Please populate it with the required values.")
+
+    # Load configuration from config.json
+    with open(CONFIG_FILE, "rb") as config_file:
+        config = orjson.loads(config_file.read())
+    cfg = Config(
+        jira_server_url=config["server_url"],
+        jira_api_token=config["api_token"],
+        todoist_api_token=config["todoist_api_token"],
+        jira_username=config.get("jira_username"),
+        debug=config.get("debug", False)  # Enable debug mode based on config
+    )
 
-async def get_green_resolution_statuses():
+    # Configure logging
+    logging.basicConfig(
+        level=logging.DEBUG if cfg.debug else logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    # Fetch the Jira username dynamically if not provided in config
+    if not cfg.jira_username:
+        cfg = replace(cfg, jira_username=await get_current_jira_user(cfg))
+    return cfg
+
+async def get_green_resolution_statuses(cfg):
     """Fetch all Jira statuses and identify green resolution statuses asynchronously."""
-    url = f"{JIRA_SERVER_URL}/rest/api/2/status"
-    headers = {
-        "Authorization": f"Bearer {JIRA_API_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as response:
+    url = f"{cfg.jira_server_url}/rest/api/2/status"
+    session = await get_session(cfg)
+
+    async def fetch():
+        async with session.get(url) as response:
             if response.status != 200:
                 logging.error(f"Error fetching Jira statuses: {response.status} - {await response.text()}")
                 response.raise_for_status()
-            statuses = await response.json()
-            green_statuses = [status["name"] for status in statuses if status.get("statusCategory", {}).get("key") == "done"]
-            logging.debug(f"Green resolution statuses: {green_statuses}")
-            return green_statuses
+            return orjson.loads(await response.read())
 
-async def get_open_jira_tickets():
+    statuses = await retry_with_backoff(fetch)
+    green_statuses = [status["name"] for status in statuses if status.get("statusCategory", {}).get("key") == "done"]
+    logging.debug(f"Green resolution statuses: {green_statuses}")
+    return green_statuses
+
+JIRA_PAGE_SIZE = 100
+
+def _name(field):
+    """Return the name of a Jira object field, or None when the field is empty."""
+    return field["name"] if field else None
+
+async def get_jira_search_page(cfg, url, query, start_at):
+    """Fetch a single page of Jira search results."""
+    session = await get_session(cfg)
+    params = {**query, "startAt": start_at, "maxResults": JIRA_PAGE_SIZE}
+
+    async def fetch():
+        async with session.get(url, params=params) as response:
+            if response.status != 200:
+                logging.error(f"Error fetching Jira tickets: {response.status} - {await response.text()}")
+                response.raise_for_status()
+            return orjson.loads(await response.read())
+
+    response_json = await retry_with_backoff(fetch)
+    # Only pay for pretty-printing the full response when debug logging is on
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(f"Jira API Response: {orjson.dumps(response_json, option=orjson.OPT_INDENT_2).decode()}")  # Log the full response
+    return response_json
+
+async def get_open_jira_tickets(cfg):
     """Fetch open Jira tickets assigned to the user, including Jira Service Management tasks."""
-    url = f"{JIRA_SERVER_URL}/rest/api/2/search"
-    headers = {
-        "Authorization": f"Bearer {JIRA_API_TOKEN}",
-        "Content-Type": "application/json"
-    }
+    url = f"{cfg.jira_server_url}/rest/api/2/search"
     # Use resolution filter to only fetch unresolved tickets and exclude blocked and cancelled
-    jql_query = f'assignee = "{JIRA_USERNAME}" AND resolution = Unresolved AND status NOT IN ("Blocked","Canceled","Cancelled")'
+    jql_query = f'assignee = "{cfg.jira_username}" AND resolution = Unresolved AND status NOT IN ("Blocked","Canceled","Cancelled") ORDER BY key ASC'
     logging.debug(f"Using JQL Query: {jql_query}")
     query = {
         "jql": jql_query,
-        "fields": "summary,duedate,priority,status,issuetype,description"  # Include description field
+        "fields": "summary,duedate,priority,status,issuetype,description",  # Include description field
+        "fieldsByKeys": "false",
+        "expand": "",  # Skip default expansions such as renderedFields
+        "validateQuery": "false"  # The query is fixed, so skip server-side JQL validation
     }
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, params=query) as response:
-            if response.status != 200:
-                logging.error(f"Error fetching Jira tickets: {response.status} - {await response.text()}")
-                response.raise_for_status()
-            response_json = await response.json()
-            logging.debug(f"Jira API Response: {json.dumps(response_json, indent=2)}")  # Log the full response
-            issues = response_json.get("issues", [])
+    # Read the total from the first page, then fetch the remaining pages concurrently.
+    # A stable ORDER BY keeps offsets consistent across pages.
+    first_page = await get_jira_search_page(cfg, url, query, 0)
+    issues = first_page.get("issues", [])
+    total = first_page.get("total", len(issues))
+    # The server may cap maxResults below what was requested
+    page_size = first_page.get("maxResults") or JIRA_PAGE_SIZE
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    pages = await asyncio.gather(*[
+        bounded(semaphore, get_jira_search_page(cfg, url, query, start_at))
+        for start_at in range(page_size, total, page_size)
+    ])
+    # Drop issues that shifted onto more than one page if the result set changed mid-fetch
+    seen_keys = {issue["key"] for issue in issues}
+    for page in pages:
+        for issue in page.get("issues", []):
+            if issue["key"] not in seen_keys:
+                seen_keys.add(issue["key"])
+                issues.append(issue)
     if not issues:
         logging.info("No tickets found.")
     else:
-        logging.info(f"Found {len(issues)} tickets assigned to {JIRA_USERNAME}.")
-    return [
-        {
+        logging.info(f"Found {len(issues)} tickets assigned to {cfg.jira_username}.")
+    tickets = []
+    for issue in issues:
+        fields = issue["fields"]
+        tickets.append({
             "key": issue["key"],
-            "summary": issue["fields"]["summary"],
-            "due_date": issue["fields"].get("duedate"),
-            "priority": issue["fields"].get("priority", {}).get("name"),
-            "status": issue["fields"].get("status", {}).get("name"),
-            "issuetype": issue["fields"].get("issuetype", {}).get("name"),
-            "description": issue["fields"].get("description")  # Fetch description
-        }
-        for issue in issues
-    ]
-
-async def get_jira_comments(ticket_key):
-    """Fetch comments for a Jira ticket."""
-    url = f"{JIRA_SERVER_URL}/rest/api/2/issue/{ticket_key}/comment"
-    headers = {
-        "Authorization": f"Bearer {JIRA_API_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as response:
+            "summary": fields["summary"],
+            "due_date": fields.get("duedate"),
+            "priority": _name(fields.get("priority")),
+            "status": _name(fields.get("status")),
+            "issuetype": _name(fields.get("issuetype")),
+            "description": fields.get("description")  # Fetch description
+        })
+    return tickets
+
+async def get_jira_comments(cfg, ticket_key):
+    """Fetch comments for a Jira ticket, or None if they could not be fetched."""
+    url = f"{cfg.jira_server_url}/rest/api/2/issue/{ticket_key}/comment"
+    session = await get_session(cfg)
+
+    async def fetch():
+        async with session.get(url) as response:
+            if response.status in RETRYABLE_STATUSES:
+                response.raise_for_status()
             if response.status != 200:
                 logging.error(f"Error fetching comments for {ticket_key}: {response.status} - {await response.text()}")
-                return []
-            response_json = await response.json()
-            comments = response_json.get("comments", [])
-            return [comment["body"] for comment in comments]
+                return None
+            return orjson.loads(await response.read())
+
+    try:
+        response_json = await retry_with_backoff(fetch)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+        logging.error(f"Error fetching comments for {ticket_key}: {error!r}")
+        return None
+    # An empty list would delete every Todoist comment, so report failures as None instead
+    if response_json is None:
+        return None
+    comments = response_json.get("comments", [])
+    return [comment["body"] for comment in comments]
 
 async def get_todoist_comments(api, task_id):
     """Fetch comments for a Todoist task."""
     try:
-        comments = await api.get_comments(task_id=task_id)
+        comments = await retry_with_backoff(partial(api.get_comments, task_id=task_id))
         # Return a mapping of comment content to its id for lookup
         return {comment.content: comment.id for comment in comments}
     except Exception as error:
@@ -141,7 +273,7 @@ async def sync_todoist_comments(api, task_id, jira_comments):
     for jira_comment in jira_comments:
         if jira_comment not in todoist_comments:
             try:
-                await api.add_comment(content=jira_comment, task_id=task_id)
+                await retry_with_backoff(partial(api.add_comment, content=jira_comment, task_id=task_id))
                 logging.info(f"Added new comment to task {task_id}: {jira_comment}")
             except Exception as error:
                 logging.error(f"Failed to add comment to task {task_id}: {jira_comment}. Error: {error}")
@@ -149,7 +281,7 @@ async def sync_todoist_comments(api, task_id, jira_comments):
             # Update existing comment if needed (Todoist doesn't allow direct content comparison)
             todoist_comment_id = todoist_comments[jira_comment]
             try:
-                await api.update_comment(comment_id=todoist_comment_id, content=jira_comment)
+                await retry_with_backoff(partial(api.update_comment, comment_id=todoist_comment_id, content=jira_comment))
                 logging.info(f"Updated comment in task {task_id}: {jira_comment}")
             except Exception as error:
                 logging.error(f"Failed to update comment in task {task_id}: {jira_comment}. Error: {error}")
@@ -160,136 +292,392 @@ async def sync_todoist_comments(api, task_id, jira_comments):
     for todoist_comment, comment_id in todoist_comments.items():
         if todoist_comment not in jira_comments:
             try:
-                await api.delete_comment(comment_id=comment_id)
+                await retry_with_backoff(partial(api.delete_comment, comment_id=comment_id))
                 logging.info(f"Deleted comment from task {task_id}: {todoist_comment}")
             except Exception as error:
                 logging.error(f"Failed to delete comment from task {task_id}: {todoist_comment}. Error: {error}")
 
-async def sync_to_todoist(jira_tickets):
-    """Sync Jira tickets and comments to Todoist asynchronously."""
-    api = TodoistAPIAsync(TODOIST_API_TOKEN)
-    project_name = "Jira Tickets"
+TODOIST_SYNC_URL = "https://api.todoist.com/sync/v9/sync"
+# The Sync API accepts at most 100 commands and a 1 MiB body per request
+TODOIST_MAX_COMMANDS = 100
+TODOIST_MAX_BATCH_BYTES = 1024 * 1024 - 1024  # Leave room for the surrounding JSON
+
+# Jira priority names mapped to a 1 (highest) to 4 (lowest) scale
+PRIORITY_MAPPING = {
+    "Blocker": 1,
+    "Critical": 1,
+    "Major": 2,
+    "Minor": 3,
+    "Trivial": 4
+}
+SKIPPED_STATUSES = frozenset({"Blocked", "Cancelled"})
+
+def desired_fields(cfg, ticket, task_priority):
+    """Build the Todoist task fields for a Jira ticket."""
+    jira_link = f"{cfg.jira_server_url}/browse/{ticket['key']}"
+    return {
+        "content": f"{ticket['key']}: {ticket['summary']}".strip(),
+        "due_date": ticket["due_date"],
+        "priority": task_priority,
+        "description": f"{jira_link}\n\n{ticket.get('description', '') or ''}"  # Add link and description
+    }
+
+def ticket_fingerprint(cfg, ticket, task_priority):
+    """Hash every input desired_fields() builds a Todoist task from, stable across process restarts."""
+    fields = (cfg.jira_server_url, ticket["summary"], ticket["due_date"], task_priority, ticket["description"])
+    return hashlib.blake2b(orjson.dumps(fields), digest_size=16).hexdigest()
+
+def to_sync_args(task):
+    """Translate REST-style task arguments into Todoist Sync API item arguments."""
+    args = {key: value for key, value in task.items() if key not in ("task_id", "due_date")}
+    if "task_id" in task:
+        args["id"] = task["task_id"]
+    if "due_date" in task:
+        args["due"] = {"date": task["due_date"]} if task["due_date"] else None
+    return args
+
+# Todoist state kept between sync cycles and persisted to STATE_FILE across restarts.
+# A cached item may also carry the jira_fingerprint of the ticket it last matched; merging
+# a changed item from Todoist replaces the dict and so drops the stale fingerprint, unless
+# the change is an update we sent, whose fingerprint waits in _pending_fingerprints.
+STATE_FILE = "state.json"
+FULL_SYNC_INTERVAL = 3600  # seconds
+TODOIST_ITEM_FIELDS = ("id", "project_id", "content", "description", "priority", "due")
+STALE_STATE_ERRORS = frozenset({"ITEM_NOT_FOUND", "PROJECT_NOT_FOUND"})
+_jira_project_id = None
+_todoist_sync_token = "*"
+_todoist_items = {}  # Sync API items in the Jira project, keyed by item id
+_pending_fingerprints = {}  # Item id -> fingerprint of an accepted update, applied on the next refresh
+_last_full_sync = 0.0
+
+def load_state():
+    """Restore the Todoist project id, sync token, and items saved by a previous run."""
+    global _jira_project_id, _todoist_sync_token, _last_full_sync
+    if not os.path.exists(STATE_FILE):
+        return
     try:
-        projects = await api.get_projects()
+        with open(STATE_FILE, "rb") as state_file:
+            state = orjson.loads(state_file.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logging.warning(f"Ignoring unreadable {STATE_FILE}: {e}")
+        return
+    _jira_project_id = state.get("project_id")
+    _todoist_sync_token = state.get("sync_token", "*")
+    _todoist_items.update(state.get("items", {}))
+    # The restored token is as good as a fresh full sync, so don't force one right away
+    _last_full_sync = time.monotonic()
+    logging.info(f"Loaded {len(_todoist_items)} cached Todoist tasks from {STATE_FILE}")
+
+def save_state():
+    """Write the Todoist sync state to STATE_FILE, replacing it atomically."""
+    state = {"project_id": _jira_project_id, "sync_token": _todoist_sync_token, "items": _todoist_items}
+    try:
+        with open(f"{STATE_FILE}.tmp", "wb") as state_file:
+            state_file.write(orjson.dumps(state))
+        os.replace(f"{STATE_FILE}.tmp", STATE_FILE)
+    except OSError as e:
+        logging.warning(f"Failed to save {STATE_FILE}: {e}")
+
+def invalidate_todoist_state():
+    """Forget the cached Todoist state so the next cycle starts over with a full sync."""
+    global _jira_project_id, _todoist_sync_token
+    _jira_project_id = None
+    _todoist_sync_token = "*"
+    _todoist_items.clear()
+    _pending_fingerprints.clear()
+    save_state()
+
+async def post_todoist_sync(cfg, payload):
+    """Send a single request to the Todoist Sync API."""
+    session = await get_session(cfg)
+    headers = {
+        "Authorization": f"Bearer {cfg.todoist_api_token}",
+        "Content-Type": "application/json"
+    }
+    body = orjson.dumps(payload)
+
+    async def send():
+        async with session.post(TODOIST_SYNC_URL, headers=headers, data=body) as response:
+            if response.status != 200:
+                logging.error(f"Error calling Todoist Sync API: {response.status} - {await response.text()}")
+                response.raise_for_status()
+            return orjson.loads(await response.read())
+
+    # Sync tokens and command uuids make these requests idempotent, so retrying is safe
+    return await retry_with_backoff(send)
+
+def chunk_todoist_commands(commands):
+    """Split commands into batches within the Sync API's per-request command and body size limits."""
+    chunk, chunk_bytes = [], 0
+    for command in commands:
+        command_bytes = len(orjson.dumps(command))
+        if chunk and (len(chunk) >= TODOIST_MAX_COMMANDS or chunk_bytes + command_bytes > TODOIST_MAX_BATCH_BYTES):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(command)
+        chunk_bytes += command_bytes + 1  # Separator between commands
+    if chunk:
+        yield chunk
+
+async def post_todoist_commands(cfg, commands):
+    """Send commands to the Todoist Sync API in size-limited batches, merging their results."""
+    result = {"sync_status": {}, "temp_id_mapping": {}}
+    for chunk in chunk_todoist_commands(commands):
+        try:
+            chunk_result = await post_todoist_sync(cfg, {"commands": chunk})
+        except Exception as e:
+            # Commands missing from sync_status are treated as rejected and retried through the REST API
+            logging.error(f"Failed to send batch of {len(chunk)} Todoist commands: {e}")
+            continue
+        result["sync_status"].update(chunk_result.get("sync_status", {}))
+        result["temp_id_mapping"].update(chunk_result.get("temp_id_mapping", {}))
+    return result
+
+async def get_jira_project_id(api):
+    """Return the id of the Jira Tickets project, creating it on first use."""
+    global _jira_project_id
+    if _jira_project_id is None:
+        project_name = "Jira Tickets"
+        projects = await retry_with_backoff(api.get_projects)
         jira_project = next((p for p in projects if p.name == project_name), None)
         if not jira_project:
-            jira_project = await api.add_project(name=project_name)
+            jira_project = await retry_with_backoff(partial(api.add_project, name=project_name))
             logging.info(f"Created project: {project_name}")
         else:
             logging.info(f"Using existing project: {project_name}")
+        _jira_project_id = jira_project.id
+    return _jira_project_id
+
+async def refresh_todoist_items(cfg, project_id):
+    """Bring the cached Todoist items up to date, fetching only changes since the last cycle."""
+    global _todoist_sync_token, _last_full_sync
+    # Periodically start over with a full sync to recover from any drift
+    if time.monotonic() - _last_full_sync >= FULL_SYNC_INTERVAL:
+        _todoist_sync_token = "*"
+    result = await post_todoist_sync(cfg, {"sync_token": _todoist_sync_token, "resource_types": ["items"]})
+    # Todoist may answer an incremental token with a full snapshot, e.g. when the token has expired
+    full_sync = _todoist_sync_token == "*" or result.get("full_sync")
+    if full_sync:
+        _todoist_items.clear()
+        _last_full_sync = time.monotonic()
+    for item in result.get("items", []):
+        if item["project_id"] == project_id and not item.get("is_deleted") and not item.get("checked"):
+            # Keep only what the sync compares, so the state file stays small
+            cached_item = {field: item.get(field) for field in TODOIST_ITEM_FIELDS}
+            fingerprint = _pending_fingerprints.pop(item["id"], None)
+            if fingerprint is not None:
+                cached_item["jira_fingerprint"] = fingerprint
+            _todoist_items[item["id"]] = cached_item
+        else:
+            _todoist_items.pop(item["id"], None)
+    # Updates we sent come back in this delta; anything left over no longer describes the item
+    _pending_fingerprints.clear()
+    _todoist_sync_token = result["sync_token"]
+    save_state()
+    logging.debug(f"Todoist {'full' if full_sync else 'incremental'} sync returned {len(result.get('items', []))} items")
+    return _todoist_items
+
+async def sync_to_todoist(cfg, jira_tickets):
+    """Sync Jira tickets and comments to Todoist asynchronously, returning the number of task changes applied."""
+    api = TodoistAPIAsync(cfg.todoist_api_token)
+    try:
+        project_id = await get_jira_project_id(api)
     except Exception as e:
-        logging.error(f"Failed to create or retrieve project '{project_name}': {e}")
-        return
+        logging.error(f"Failed to create or retrieve project 'Jira Tickets': {e}")
+        return 0
 
     try:
-        existing_tasks = await api.get_tasks(project_id=jira_project.id)
+        existing_tasks = (await refresh_todoist_items(cfg, project_id)).values()
         # Normalize task keys by stripping whitespace and ensuring consistent formatting
         existing_task_map = {}
         for task in existing_tasks:
-            if ":" in task.content:
-                jira_key = task.content.split(":")[0].strip()
-                existing_task_map[jira_key] = task
+            jira_key, separator, _ = task["content"].partition(":")
+            if separator:
+                existing_task_map[jira_key.strip()] = task
     except Exception as e:
         logging.error(f"Failed to retrieve existing tasks: {e}")
-        return
+        return 0
 
     # Prepare batch updates, additions, and deletions
     tasks_to_update = []
     tasks_to_add = []
     tasks_to_delete = []
+    unchanged_count = 0
+    update_fingerprints = {}
 
     jira_ticket_keys = {ticket["key"] for ticket in jira_tickets}
 
     # Identify tasks to delete (tasks that no longer exist in Jira)
-    for task_key, task in existing_task_map.items():
-        if task_key not in jira_ticket_keys:
-            tasks_to_delete.append(task.id)
-            logging.debug(f"Marked task for deletion: {task_key} (Task ID: {task.id})")
+    for task_key in existing_task_map.keys() - jira_ticket_keys:
+        task = existing_task_map[task_key]
+        tasks_to_delete.append(task["id"])
+        logging.debug(f"Marked task for deletion: {task_key} (Task ID: {task['id']})")
 
     for ticket in jira_tickets:
-        if ticket["status"] in {"Blocked"}:  # Skip blocked tickets
+        if ticket["status"] in SKIPPED_STATUSES:  # Skip blocked and cancelled tickets
             continue
 
-        task_content = f"{ticket['key']}: {ticket['summary']}".strip()
-        task_due_date = ticket["due_date"]
-        task_priority = 4  # Default priority
-        jira_link = f"{JIRA_SERVER_URL}/browse/{ticket['key']}"
-        comments = await get_jira_comments(ticket["key"])  # Fetch comments
-        task_description = f"{jira_link}\n\n{ticket.get('description', '') or ''}"  # Add link and description
-
-        if ticket["priority"]:
-            priority_mapping = {
-                "Blocker": 1,
-                "Critical": 1,
-                "Major": 2,
-                "Minor": 3,
-                "Trivial": 4
-            }
-            jira_priority = priority_mapping.get(ticket["priority"], 4)
-            # Invert the priority for Todoist
-            task_priority = 5 - jira_priority
-            logging.debug(f"Ticket {ticket['key']} has Jira priority '{ticket['priority']}' mapped to Todoist priority {task_priority}")
-
-        if ticket["key"] in existing_task_map:
-            # Update existing task
-            existing_task = existing_task_map[ticket["key"]]
-            update_payload = {
-                "task_id": existing_task.id,
-                "content": task_content,
-                "due_date": task_due_date,
-                "priority": task_priority,
-                "description": task_description
-            }
-            logging.debug(f"Updating task with payload: {update_payload}")
-            tasks_to_update.append(update_payload)
-            # Sync comments with the existing task
-            await sync_todoist_comments(api, existing_task.id, comments)
+        comments = await get_jira_comments(cfg, ticket["key"])  # Fetch comments
+        jira_priority = PRIORITY_MAPPING.get(ticket["priority"], 4)
+        # Invert the priority for Todoist
+        task_priority = 5 - jira_priority
+        logging.debug(f"Ticket {ticket['key']} has Jira priority '{ticket['priority']}' mapped to Todoist priority {task_priority}")
+
+        existing_task = existing_task_map.get(ticket["key"])
+        if existing_task is not None:
+            # Update existing task, unless it already matches the Jira ticket
+            fingerprint = ticket_fingerprint(cfg, ticket, task_priority)
+            if existing_task.get("jira_fingerprint") == fingerprint:
+                unchanged_count += 1
+            else:
+                fields = desired_fields(cfg, ticket, task_priority)
+                current = {
+                    "content": existing_task["content"],
+                    "due_date": (existing_task.get("due") or {}).get("date"),
+                    "priority": existing_task["priority"],
+                    "description": existing_task["description"]
+                }
+                if fields == current:
+                    unchanged_count += 1
+                    existing_task["jira_fingerprint"] = fingerprint
+                else:
+                    update_payload = {"task_id": existing_task["id"], **fields}
+                    logging.debug(f"Updating task with payload: {update_payload}")
+                    tasks_to_update.append(update_payload)
+                    update_fingerprints[existing_task["id"]] = fingerprint
+            # Sync comments with the existing task, unless they could not be fetched
+            if comments is not None:
+                await sync_todoist_comments(api, existing_task["id"], comments)
         else:
             # Add new task
-            new_task = {
-                "content": task_content,
-                "project_id": jira_project.id,
-                "due_date": task_due_date,
-                "priority": task_priority,
-                "description": task_description
-            }
+            new_task = {"project_id": project_id, **desired_fields(cfg, ticket, task_priority)}
             logging.debug(f"Creating new task with payload: {new_task}")
-            try:
-                created_task = await api.add_task(**new_task)
-                logging.info(f"Added new task: {created_task.id}")
-                # Sync comments with the new task
-                await sync_todoist_comments(api, created_task.id, comments)
-            except Exception as e:
-                logging.error(f"Failed to add new task: {e}")
+            tasks_to_add.append((new_task, comments))
 
-    # Perform batch updates asynchronously
-    update_tasks = [api.update_task(**task) for task in tasks_to_update]
-    delete_tasks = [api.delete_task(task_id=task_id) for task_id in tasks_to_delete]
+    # Build Sync API commands for all updates, additions, and deletions
+    commands = []
+    update_commands = {}
+    add_commands = {}
+    delete_commands = {}
+    for task in tasks_to_update:
+        command = {"type": "item_update", "uuid": uuid4().hex, "args": to_sync_args(task)}
+        commands.append(command)
+        update_commands[command["uuid"]] = task
+    for new_task, comments in tasks_to_add:
+        command = {"type": "item_add", "uuid": uuid4().hex, "temp_id": uuid4().hex, "args": to_sync_args(new_task)}
+        commands.append(command)
+        add_commands[command["uuid"]] = (command["temp_id"], new_task, comments)
+    for task_id in tasks_to_delete:
+        command = {"type": "item_delete", "uuid": uuid4().hex, "args": {"id": task_id}}
+        commands.append(command)
+        delete_commands[command["uuid"]] = task_id
 
-    try:
-        await asyncio.gather(*update_tasks)
-        logging.info(f"Updated {len(update_tasks)} tasks.")
-    except Exception as e:
-        logging.error(f"Failed to update some tasks: {e}")
+    if not commands:
+        logging.info(f"No Todoist changes to send. Unchanged: {unchanged_count}")
+        return 0
 
     try:
-        await asyncio.gather(*delete_tasks)
-        logging.info(f"Deleted {len(delete_tasks)} tasks.")
+        result = await post_todoist_commands(cfg, commands)
     except Exception as e:
-        logging.error(f"Failed to delete some tasks: {e}")
+        logging.error(f"Failed to send Todoist batch: {e}")
+        return 0
+    sync_status = result.get("sync_status", {})
+    temp_id_mapping = result.get("temp_id_mapping", {})
+    rejected = {command["uuid"] for command in commands if sync_status.get(command["uuid"]) != "ok"}
+    # Only count changes Todoist actually applied, so persistently failing tasks don't look like activity
+    applied_count = len(commands) - len(rejected)
+    # Stamp accepted updates so the next cycle can skip them without rebuilding their fields
+    for uuid, task in update_commands.items():
+        if uuid not in rejected:
+            _pending_fingerprints[task["task_id"]] = update_fingerprints[task["task_id"]]
+    for uuid in rejected:
+        logging.warning(f"Todoist rejected command {uuid}: {sync_status.get(uuid)}")
+    logging.info(
+        f"Sent {len(commands)} Todoist commands: {len(tasks_to_update)} updates, "
+        f"{len(tasks_to_add)} additions, {len(tasks_to_delete)} deletions ({len(rejected)} rejected). "
+        f"Unchanged: {unchanged_count}"
+    )
+    # Commands against tasks or a project that no longer exist mean the cached state has drifted
+    stale = {
+        uuid for uuid in rejected
+        if isinstance(sync_status.get(uuid), dict) and sync_status[uuid].get("error_tag") in STALE_STATE_ERRORS
+    }
+    if stale:
+        logging.warning(f"{len(stale)} commands referenced missing Todoist objects; resyncing from scratch next cycle.")
+        invalidate_todoist_state()
+        rejected -= stale
+
+    new_task_ids = {
+        uuid: temp_id_mapping[temp_id]
+        for uuid, (temp_id, _, _) in add_commands.items()
+        if uuid not in rejected and temp_id in temp_id_mapping
+    }
+
+    # Fall back to the REST API for any commands the batch rejected, overlapping all kinds of operations
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    ops = (
+        [("update", uuid, partial(api.update_task, **task)) for uuid, task in update_commands.items() if uuid in rejected]
+        + [("add", uuid, partial(api.add_task, **add_commands[uuid][1])) for uuid in add_commands if uuid in rejected]
+        + [("delete", uuid, partial(api.delete_task, task_id=task_id)) for uuid, task_id in delete_commands.items() if uuid in rejected]
+    )
+    if ops:
+        results = await asyncio.gather(
+            *(bounded(semaphore, retry_with_backoff(op)) for _, _, op in ops),
+            return_exceptions=True
+        )
+        succeeded = {"update": 0, "add": 0, "delete": 0}
+        failed = {"update": 0, "add": 0, "delete": 0}
+        for (kind, uuid, _), result in zip(ops, results):
+            if isinstance(result, Exception):
+                failed[kind] += 1
+                logging.error(f"Failed to {kind} task via REST fallback (command {uuid}): {result}")
+                continue
+            succeeded[kind] += 1
+            applied_count += 1
+            if kind == "add":
+                new_task_ids[uuid] = result.id
+        logging.info(f"REST fallback succeeded: {succeeded}, failed: {failed}")
+
+    # Sync comments with the newly created tasks
+    for uuid, task_id in new_task_ids.items():
+        logging.info(f"Added new task: {task_id}")
+        comments = add_commands[uuid][2]
+        if comments is not None:
+            await sync_todoist_comments(api, task_id, comments)
+
+    return applied_count
+
+# Poll every minute while tickets are changing, backing off to 10 minutes when idle
+MIN_POLL_INTERVAL = 60  # seconds
+MAX_POLL_INTERVAL = 600  # seconds
 
 async def run_service():
-    """Run the sync process as a service, checking every 5 minutes."""
-    while True:
-        logging.info("Starting Jira to Todoist sync...")
-        try:
-            jira_tickets = await get_open_jira_tickets()
-            logging.debug(f"Jira Tickets: {jira_tickets}")
-            await sync_to_todoist(jira_tickets)
-        except Exception as e:
-            logging.error(f"Error during sync: {e}")
-        logging.info("Sync complete. Waiting for 5 minutes...")
-        await asyncio.sleep(300)
+    """Run the sync process as a service, polling more often while changes are flowing."""
+    try:
+        cfg = await init()
+        load_state()
+        idle_cycles = 0
+        while True:
+            logging.info("Starting Jira to Todoist sync...")
+            changes = 0
+            try:
+                jira_tickets = await get_open_jira_tickets(cfg)
+                logging.debug(f"Jira Tickets: {jira_tickets}")
+                changes = await sync_to_todoist(cfg, jira_tickets)
+            except Exception as e:
+                logging.error(f"Error during sync: {e}")
+            if changes:
+                idle_cycles = 0
+                delay = MIN_POLL_INTERVAL
+            else:
+                delay = min(MAX_POLL_INTERVAL, MIN_POLL_INTERVAL * 2 ** (idle_cycles + 1))
+                if delay < MAX_POLL_INTERVAL:
+                    idle_cycles += 1
+            logging.info(f"Sync complete. Waiting for {delay} seconds...")
+            await asyncio.sleep(delay)
+    finally:
+        if _session is not None:
+            await _session.close()
 
 if __name__ == "__main__":
     asyncio.run(run_service())